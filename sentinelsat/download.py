@@ -101,8 +101,11 @@ class Downloader:
         self.lta_retry_delay = lta_retry_delay
         self.lta_timeout = lta_timeout
         self.chunk_size = 2**20  # download in 1 MB chunks by default
+        # Checksum state of interrupted downloads and the number of bytes it covers, by file path.
+        # Lets a retry hash only the part of the incomplete file that it has not seen yet.
+        self._partial_checksums = {}
 
-    def download(self, id, directory=".", *, stop_event=None):
+    def download(self, id, directory=".", *, stop_event=None, product_info=None):
         """Download a product.
 
         Parameters
@@ -113,6 +116,9 @@ class Downloader:
             Where the file will be downloaded
         stop_event : threading.Event, optional
             An event object can be provided and set to interrupt the download.
+        product_info : dict, optional
+            The product's info as returned by :meth:`SentinelAPI.get_product_odata()`.
+            Fetched from the server if not provided.
 
         Returns
         -------
@@ -129,10 +135,11 @@ class Downloader:
         LTAError
             If the product has been archived and its retrieval failed.
         """
+        if product_info is None:
+            product_info = self.api.get_product_odata(id)
         if self.node_filter:
-            return self._download_with_node_filter(id, directory, stop_event)
+            return self._download_with_node_filter(id, directory, stop_event, product_info)
 
-        product_info = self.api.get_product_odata(id)
         filename = self.api._get_filename(product_info)
         path = Path(directory) / filename
         product_info["path"] = str(path)
@@ -150,8 +157,7 @@ class Downloader:
         self._download_common(product_info, path, stop_event)
         return product_info
 
-    def _download_with_node_filter(self, id, directory, stop_event):
-        product_info = self.api.get_product_odata(id)
+    def _download_with_node_filter(self, id, directory, stop_event, product_info):
         product_path = Path(directory) / (product_info["product_root_dir"])
         product_info["node_path"] = "./" + product_info["product_root_dir"]
         manifest_path = product_path / product_info["manifest_name"]
@@ -184,8 +190,11 @@ class Downloader:
         # Use a temporary file for downloading
         temp_path = path.with_name(path.name + ".incomplete")
         skip_download = False
-        if temp_path.exists():
+        try:
             size = temp_path.stat().st_size
+        except FileNotFoundError:
+            size = None
+        if size is not None:
             if size > product_info["size"]:
                 self.logger.warning(
                     "Existing incomplete file %s is larger than the expected final size"
@@ -213,18 +222,22 @@ class Downloader:
                 )
                 pass
         if not skip_download:
+            # Compute the checksum while downloading instead of reading the file again afterwards
+            algo, checksum = None, None
+            if self.verify_checksum is True:
+                algo, checksum = self.api._checksum_algo(product_info)
             # Store the number of downloaded bytes for unit tests
             temp_path.parent.mkdir(parents=True, exist_ok=True)
-            product_info["downloaded_bytes"] = self._download(
+            product_info["downloaded_bytes"], algo = self._download(
                 product_info["url"],
                 temp_path,
                 product_info["size"],
                 path.name,
                 stop_event,
+                algo,
             )
-        # Check integrity with MD5 checksum
-        if self.verify_checksum is True:
-            if not self.api._checksum_compare(temp_path, product_info):
+            # Check integrity with MD5 checksum
+            if algo is not None and algo.hexdigest().lower() != checksum.lower():
                 temp_path.unlink()
                 raise InvalidChecksumError("File corrupt: checksums do not match")
         # Download successful, rename the temporary file to its proper name
@@ -387,38 +400,68 @@ class Downloader:
         product_infos = {}
         exceptions = {}
         # Get online status and product info.
-        for pid in self._tqdm(
-            iterable=product_ids, desc="Fetching archival status", unit="product", delay=2
-        ):
-            assert isinstance(pid, str)
+        # The requests are made concurrently, the number of parallel requests is still capped
+        # by the API's dl_limit_semaphore.
+        assert all(isinstance(pid, str) for pid in product_ids)
+        with ThreadPoolExecutor(
+            max_workers=min(self.n_concurrent_dl, len(product_ids)),
+            thread_name_prefix="odata",
+        ) as executor:
+            odata_tasks = {
+                executor.submit(self.api.get_product_odata, pid): pid for pid in product_ids
+            }
             try:
-                info = self.api.get_product_odata(pid)
-            except UnauthorizedError:
+                for task in self._tqdm(
+                    iterable=concurrent.futures.as_completed(odata_tasks),
+                    total=len(odata_tasks),
+                    desc="Fetching archival status",
+                    unit="product",
+                    delay=2,
+                ):
+                    pid = odata_tasks[task]
+                    try:
+                        info = task.result()
+                    except UnauthorizedError:
+                        raise
+                    except SentinelAPIError as e:
+                        exceptions[pid] = e
+                        if self.fail_fast:
+                            raise
+                        self.logger.error(
+                            "Getting product info for %s failed, can't download: %s",
+                            pid,
+                            _format_exception(e),
+                        )
+                        continue
+                    product_infos[pid] = info
+                    if product_infos[pid]["Online"]:
+                        statuses[pid] = DownloadStatus.ONLINE
+                        online_prods.add(pid)
+                    else:
+                        statuses[pid] = DownloadStatus.OFFLINE
+                        offline_prods.add(pid)
+            except:
+                for t in odata_tasks:
+                    t.cancel()
                 raise
-            except SentinelAPIError as e:
-                exceptions[pid] = e
-                if self.fail_fast:
-                    raise
-                self.logger.error(
-                    "Getting product info for %s failed, can't download: %s",
-                    pid,
-                    _format_exception(e),
-                )
-                continue
-            product_infos[pid] = info
-            if product_infos[pid]["Online"]:
-                statuses[pid] = DownloadStatus.ONLINE
-                online_prods.add(pid)
-            else:
-                statuses[pid] = DownloadStatus.OFFLINE
-                offline_prods.add(pid)
         return statuses, online_prods, offline_prods, product_infos, exceptions
 
     def _skip_existing_products(self, directory, products, product_infos, statuses, exceptions):
-        for pid in list(products):
+        if not products:
+            return
+        # Look up the filenames concurrently instead of one round-trip at a time.
+        # The number of parallel requests is still capped by the API's dl_limit_semaphore.
+        with ThreadPoolExecutor(
+            max_workers=min(self.n_concurrent_dl, len(products)),
+            thread_name_prefix="filename",
+        ) as executor:
+            filename_tasks = {
+                pid: executor.submit(self.api._get_filename, product_infos[pid]) for pid in products
+            }
+        for pid, task in filename_tasks.items():
             product_info = product_infos[pid]
             try:
-                filename = self.api._get_filename(product_info)
+                filename = task.result()
             except SentinelAPIError as e:
                 exceptions[pid] = e
                 if self.fail_fast:
@@ -605,7 +648,10 @@ class Downloader:
         downloaded_quicklooks = {}
         failed_quicklooks = {}
 
-        with ThreadPoolExecutor(max_workers=self.n_concurrent_dl) as dl_exec:
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(self.n_concurrent_dl, len(products))),
+            thread_name_prefix="quicklook",
+        ) as dl_exec:
             dl_tasks = {}
             for pid in products:
                 future = dl_exec.submit(self.download_quicklook, pid, directory)
@@ -697,7 +743,10 @@ class Downloader:
                 if cnt > 0:
                     _wait(stop_event, self.dl_retry_delay)
                 statuses[uuid] = DownloadStatus.DOWNLOAD_STARTED
-                return self.download(uuid, directory, stop_event=stop_event)
+                # Reuse the product info fetched by download_all() to skip a redundant request
+                return self.download(
+                    uuid, directory, stop_event=stop_event, product_info=product_info
+                )
             except (concurrent.futures.CancelledError, KeyboardInterrupt, SystemExit):
                 raise
             except Exception as e:
@@ -720,42 +769,77 @@ class Downloader:
                 last_exception = e
         raise last_exception
 
-    def _download(self, url, path, file_size, title, stop_event):
+    def _download(self, url, path, file_size, title, stop_event, algo=None):
         headers = {}
-        continuing = path.exists()
-        if continuing:
+        try:
             already_downloaded_bytes = path.stat().st_size
+            continuing = True
             headers = {"Range": "bytes={}-".format(already_downloaded_bytes)}
-        else:
+        except FileNotFoundError:
             already_downloaded_bytes = 0
+            continuing = False
+        resumed_algo, hashed_bytes = self._partial_checksums.pop(path, (None, 0))
+        if continuing and algo is not None:
+            if (
+                resumed_algo is None
+                or resumed_algo.name != algo.name
+                or hashed_bytes > already_downloaded_bytes
+            ):
+                resumed_algo, hashed_bytes = algo.copy(), 0
+            # Hash the existing part before connecting, so that the connection does not sit idle
+            # while reading from disk. The original object is kept in case the server restarts.
+            # A failed previous attempt leaves its checksum state behind, only the part it did not
+            # cover is read again.
+            self.api._checksum_update(resumed_algo, path, offset=hashed_bytes)
+        else:
+            resumed_algo = None
+        # Checksum state matching the current content of the file, kept if this attempt fails
+        file_algo, file_start = resumed_algo, already_downloaded_bytes
         downloaded_bytes = 0
-        with self.api.dl_limit_semaphore:
-            r = self.api.session.get(url, stream=True, headers=headers)
-        with self._tqdm(
-            desc=f"Downloading {title}",
-            total=file_size,
-            unit="B",
-            unit_scale=True,
-            initial=already_downloaded_bytes,
-        ) as progress, closing(r):
-            self.api._check_scihub_response(r, test_json=False)
-            mode = "ab" if continuing else "wb"
-            with open(path, mode) as f:
-                iterator = r.iter_content(chunk_size=self.chunk_size)
-                while True:
-                    if stop_event and stop_event.is_set():
-                        raise concurrent.futures.CancelledError()
-                    try:
-                        with self.api.dl_limit_semaphore:
-                            chunk = next(iterator)
-                    except StopIteration:
-                        break
-                    if chunk:  # filter out keep-alive new chunks
-                        f.write(chunk)
-                        progress.update(len(chunk))
-                        downloaded_bytes += len(chunk)
-            # Return the number of bytes downloaded
-            return downloaded_bytes
+        try:
+            with self.api.dl_limit_semaphore:
+                r = self.api.session.get(url, stream=True, headers=headers)
+            with self._tqdm(
+                desc=f"Downloading {title}",
+                total=file_size,
+                unit="B",
+                unit_scale=True,
+                initial=already_downloaded_bytes,
+            ) as progress, closing(r):
+                self.api._check_scihub_response(r, test_json=False)
+                if continuing and r.status_code != 206:
+                    # The server ignored the Range header and is sending the whole file
+                    self.logger.info(
+                        "Server does not support resuming, restarting download of %s", title
+                    )
+                    continuing = False
+                    progress.reset()
+                if continuing and resumed_algo is not None:
+                    algo = resumed_algo
+                mode = "ab" if continuing else "wb"
+                with open(path, mode) as f:
+                    file_algo, file_start = algo, already_downloaded_bytes if continuing else 0
+                    iterator = r.iter_content(chunk_size=self.chunk_size)
+                    while True:
+                        if stop_event and stop_event.is_set():
+                            raise concurrent.futures.CancelledError()
+                        try:
+                            with self.api.dl_limit_semaphore:
+                                chunk = next(iterator)
+                        except StopIteration:
+                            break
+                        if chunk:  # filter out keep-alive new chunks
+                            f.write(chunk)
+                            if algo is not None:
+                                algo.update(chunk)
+                            progress.update(len(chunk))
+                            downloaded_bytes += len(chunk)
+                # Return the number of bytes downloaded and the checksum of the complete file
+                return downloaded_bytes, algo
+        except BaseException:
+            if file_algo is not None:
+                self._partial_checksums[path] = (file_algo, file_start + downloaded_bytes)
+            raise
 
     def _dataobj_to_node_info(self, dataobj_info, product_info):
         path = dataobj_info["href"]
@@ -791,22 +875,18 @@ class Downloader:
 def _xml_to_dataobj_info(element):
     assert etree.iselement(element)
     assert element.tag == "dataObject"
-    data = dict(
-        id=element.attrib["ID"],
-    )
-    elem = element.find("byteStream")
-    # data["mime_type"] = elem.attrib['mimeType']
-    data["size"] = int(elem.attrib["size"])
-    elem = element.find("byteStream/fileLocation")
-    data["href"] = elem.attrib["href"]
-    # data['locator_type'] = elem.attrib["locatorType"]
-    # assert data['locator_type'] == "URL"
-
-    elem = element.find("byteStream/checksum")
-    assert elem.attrib["checksumName"].upper() in ["MD5", "SHA3-256"]
-    data[elem.attrib["checksumName"].lower()] = elem.text
-
-    return data
+    byte_stream = element.find("byteStream")
+    file_location = byte_stream.find("fileLocation")
+    # assert file_location.attrib["locatorType"] == "URL"
+    checksum = byte_stream.find("checksum")
+    assert checksum.attrib["checksumName"].upper() in ["MD5", "SHA3-256"]
+    return {
+        "id": element.attrib["ID"],
+        # "mime_type": byte_stream.attrib["mimeType"],
+        "size": int(byte_stream.attrib["size"]),
+        "href": file_location.attrib["href"],
+        checksum.attrib["checksumName"].lower(): checksum.text,
+    }
 
 
 def _format_exception(ex):
@@ -5,7 +5,6 @@ import os
 import re
 
 import click
-import geojson as gj
 import requests.utils
 from tqdm.auto import tqdm
 
@@ -369,6 +368,8 @@ def cli(
     products = api.query(date=(start, end), order_by=order_by, limit=limit, **search_kwargs)
 
     if footprints is not None:
+        import geojson as gj
+
         footprints_geojson = api.to_geojson(products)
         gj.dump(footprints_geojson, footprints)
         footprints.close()
@@ -1,19 +1,22 @@
 import hashlib
 import logging
+import os
 import re
 import threading
 import xml.etree.ElementTree as ET
-from collections import OrderedDict, defaultdict, namedtuple
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from copy import copy
 from datetime import date, datetime, timedelta
+from functools import lru_cache
+from html.parser import HTMLParser
 from pathlib import Path
 from typing import Dict
 from urllib.parse import quote_plus, urljoin
 
-import geojson
-import geomet.wkt
-import html2text
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from tqdm.auto import tqdm
 
 from sentinelsat.download import DownloadStatus, Downloader
@@ -28,6 +31,9 @@ from sentinelsat.exceptions import (
 )
 from . import __version__ as sentinelsat_version
 
+# Divisors to convert the "size" values of OpenSearch responses to GB
+_SIZE_UNIT_DIVISORS = {"MB": 1024.0, "KB": 1024.0 * 1024.0}
+
 
 class SentinelAPI:
     """Class to connect to Copernicus Open Access Hub, search and download imagery.
@@ -91,12 +97,35 @@ class SentinelAPI:
         self._concurrent_dl_limit = 4
         self._concurrent_lta_trigger_limit = 10
 
+        # Keep enough pooled keep-alive connections for all concurrent downloads and LTA requests.
+        # The default pool size of 10 would otherwise lead to connections being discarded and
+        # re-established while downloading.
+        # Failures to connect are retried with exponential backoff at the transport level. Read
+        # errors and all responses, including ones with a Retry-After header, are passed on
+        # unchanged to the callers, which handle LTA, quota and concurrency limit errors.
+        adapter = HTTPAdapter(
+            pool_maxsize=self._concurrent_dl_limit + self._concurrent_lta_trigger_limit,
+            max_retries=Retry(
+                total=3,
+                read=False,
+                redirect=False,
+                status=False,
+                respect_retry_after_header=False,
+                backoff_factor=0.5,
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
         # The number of allowed concurrent GET requests is limited on the server side.
         # We use a bounded semaphore to ensure we stay within that limit.
         # Notably, LTA trigger requests also count against that limit.
         self._dl_limit_semaphore = threading.BoundedSemaphore(self._concurrent_dl_limit)
         self._lta_limit_semaphore = threading.BoundedSemaphore(self._concurrent_lta_trigger_limit)
 
+        # Product filenames never change, remember them to avoid repeated lookups on retries
+        self._filenames = {}
+
         self.downloader = Downloader(self)
 
     @property
@@ -325,7 +354,7 @@ class SentinelAPI:
             query_parts.append(raw)
 
         if area is not None:
-            query_parts.append('footprint:"{}({})"'.format(area_relation, area))
+            query_parts.append(f'footprint:"{area_relation}({area})"')
 
         return " ".join(query_parts)
 
@@ -365,20 +394,45 @@ class SentinelAPI:
                 total=max_offset - offset,
                 unit="product",
             )
-            for new_offset in range(offset + self.page_size, max_offset, self.page_size):
-                new_limit = limit
-                if limit is not None:
-                    new_limit = limit - new_offset + offset
-                ret = self._load_subquery(query, order_by, new_limit, new_offset)[0]
-                progress.update(len(ret))
-                products += ret
-            progress.close()
+            # The offsets of all remaining pages are known at this point, so they are requested
+            # concurrently. The number of parallel requests is capped by dl_limit_semaphore.
+            offsets = range(offset + self.page_size, max_offset, self.page_size)
+            with ThreadPoolExecutor(
+                max_workers=min(self.concurrent_dl_limit, len(offsets)),
+                thread_name_prefix="query",
+            ) as executor:
+                page_tasks = []
+                for new_offset in offsets:
+                    new_limit = limit
+                    if limit is not None:
+                        new_limit = limit - new_offset + offset
+                    page_tasks.append(
+                        executor.submit(self._request_page, query, order_by, new_limit, new_offset)
+                    )
+                try:
+                    for task in as_completed(page_tasks):
+                        progress.update(len(task.result()[0]))
+                except:
+                    for task in page_tasks:
+                        task.cancel()
+                    raise
+                finally:
+                    progress.close()
+            for task in page_tasks:
+                products += task.result()[0]
 
         return products, count
 
     def _load_subquery(self, query, order_by=None, limit=None, offset=0):
         # store last query (for testing)
         self._last_query = query
+        products, total_results, response = self._request_page(query, order_by, limit, offset)
+        # store last status code (for testing)
+        self._last_response = response
+        return products, total_results
+
+    def _request_page(self, query, order_by=None, limit=None, offset=0):
+        # Does not modify the API object, so that pages can be requested from worker threads
         self.logger.debug("Sub-query: offset=%s, limit=%s", offset, limit)
 
         # load query results
@@ -386,14 +440,11 @@ class SentinelAPI:
         # Unlike POST, DHuS only accepts latin1 charset in the GET params
         with self.dl_limit_semaphore:
             response = self.session.get(url, params={"q": query.encode("latin1")})
-        self._check_scihub_response(response, query_string=query)
-
-        # store last status code (for testing)
-        self._last_response = response
+        json_response = self._check_scihub_response(response, query_string=query)
 
         # parse response content
         try:
-            json_feed = response.json()["feed"]
+            json_feed = json_response["feed"]
             if "error" in json_feed:
                 message = json_feed["error"]["message"]
                 message = message.replace("org.apache.solr.search.SyntaxError: ", "")
@@ -408,16 +459,15 @@ class SentinelAPI:
         if isinstance(products, dict):
             products = [products]
 
-        return products, total_results
+        return products, total_results, response
 
     def _format_url(self, order_by=None, limit=None, offset=0):
         if limit is None:
             limit = self.page_size
         limit = min(limit, self.page_size)
-        url = "search?format=json&rows={}".format(limit)
-        url += "&start={}".format(offset)
+        url = f"search?format=json&rows={limit}&start={offset}"
         if order_by:
-            url += "&orderby={}".format(order_by)
+            url += f"&orderby={order_by}"
         return urljoin(self.api_url, url)
 
     @staticmethod
@@ -425,17 +475,19 @@ class SentinelAPI:
         """Return the products from a query response as a GeoJSON with the values in their
         appropriate Python types.
         """
+        import geojson
+        import geomet.wkt
+
         feature_list = []
         for i, (product_id, props) in enumerate(products.items()):
-            props = props.copy()
-            props["id"] = product_id
             poly = geomet.wkt.loads(props["footprint"])
-            del props["footprint"]
-            del props["gmlfootprint"]
             # Fix "'datetime' is not JSON serializable"
-            for k, v in props.items():
-                if isinstance(v, (date, datetime)):
-                    props[k] = v.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+            props = {
+                k: v.strftime("%Y-%m-%dT%H:%M:%S.%fZ") if isinstance(v, (date, datetime)) else v
+                for k, v in props.items()
+                if k not in ("footprint", "gmlfootprint")
+            }
+            props["id"] = product_id
             feature_list.append(geojson.Feature(geometry=poly, id=i, properties=props))
         return geojson.FeatureCollection(feature_list)
 
@@ -469,9 +521,13 @@ class SentinelAPI:
             return gpd.GeoDataFrame(crs=crs, geometry=[])
 
         df = SentinelAPI.to_dataframe(products)
-        geometry = [shapely.wkt.loads(fp) for fp in df["footprint"]]
+        if hasattr(shapely, "from_wkt"):
+            # Shapely 2.0+ parses the whole column in a single vectorized call
+            geometry = shapely.from_wkt(df["footprint"].to_numpy())
+        else:
+            geometry = [shapely.wkt.loads(fp) for fp in df["footprint"]]
         # remove useless columns
-        df.drop(["footprint", "gmlfootprint"], axis=1, inplace=True)
+        df = df.drop(columns=["footprint", "gmlfootprint"])
         return gpd.GeoDataFrame(df, crs=crs, geometry=geometry)
 
     def get_product_odata(self, id, full=False):
@@ -508,8 +564,7 @@ class SentinelAPI:
             url += "&$expand=Attributes"
         with self.dl_limit_semaphore:
             response = self.session.get(url)
-        self._check_scihub_response(response)
-        values = _parse_odata_response(response.json()["d"])
+        values = _parse_odata_response(self._check_scihub_response(response)["d"])
         if values["title"].startswith("S3"):
             values["manifest_name"] = "xfdumanifest.xml"
             values["product_root_dir"] = values["title"] + ".SEN3"
@@ -544,14 +599,13 @@ class SentinelAPI:
         with self.dl_limit_semaphore:
             r = self.session.get(url)
         try:
-            self._check_scihub_response(r)
+            return self._check_scihub_response(r)
         except ServerError as e:
             # Handle DHuS versions that do not set the Online attribute
             if "Could not find property with name: 'Online'" in e.msg:
                 self._online_attribute_used = False
                 return True
             raise
-        return r.json()
 
     def download(self, id, directory_path=".", checksum=True, nodefilter=None):
         """Download a product.
@@ -596,6 +650,13 @@ class SentinelAPI:
         return downloader.download(id, directory_path)
 
     def _get_filename(self, product_info):
+        filename = self._filenames.get(product_info["url"])
+        if filename is None:
+            filename = self._request_filename(product_info)
+            self._filenames[product_info["url"]] = filename
+        return filename
+
+    def _request_filename(self, product_info):
         if product_info["Online"]:
             with self.dl_limit_semaphore:
                 req = self.session.head(product_info["url"])
@@ -795,15 +856,9 @@ class SentinelAPI:
     def get_products_size(products):
         """Return the total file size in GB of all products in the OpenSearch response."""
         size_total = 0
-        for title, props in products.items():
-            size_product = props["size"]
-            size_value = float(size_product.split(" ")[0])
-            size_unit = str(size_product.split(" ")[1])
-            if size_unit == "MB":
-                size_value /= 1024.0
-            if size_unit == "KB":
-                size_value /= 1024.0 * 1024.0
-            size_total += size_value
+        for props in products.values():
+            size_value, size_unit = props["size"].split(" ", 1)
+            size_total += float(size_value) / _SIZE_UNIT_DIVISORS.get(size_unit, 1.0)
         return round(size_total, 2)
 
     @staticmethod
@@ -850,7 +905,7 @@ class SentinelAPI:
             products.update(self.query(identifier=name))
 
         # Group the products
-        output = OrderedDict((name, dict()) for name in names)
+        output = {name: {} for name in names}
         for id, metadata in products.items():
             name = metadata["identifier"]
             output[name][id] = metadata
@@ -923,6 +978,7 @@ class SentinelAPI:
 
         # Now go over the list of products and check them
         corrupt = {}
+        existing_paths = []
         for path in paths:
             name = path.stem
 
@@ -934,49 +990,77 @@ class SentinelAPI:
                 self.logger.info("%s does not exist on disk", path)
                 corrupt[str(path)] = product_infos[name]
                 continue
+            existing_paths.append(path)
 
-            is_fine = False
-            for product_info in product_infos[name]:
-                if path.stat().st_size == product_info["size"] and self._checksum_compare(
-                    path, product_info
-                ):
-                    is_fine = True
-                    break
-            if not is_fine:
-                self.logger.info("%s is corrupt", path)
-                corrupt[str(path)] = product_infos[name]
-                if delete:
-                    path.unlink()
+        def is_fine(path):
+            size = path.stat().st_size
+            return any(
+                size == product_info["size"] and self._checksum_compare(path, product_info)
+                for product_info in product_infos[path.stem]
+            )
+
+        # Products sharing a title map to the same file, which must be checked and deleted only once
+        existing_paths = list(dict.fromkeys(existing_paths))
+        if existing_paths:
+            # Checksum the files concurrently, hashlib releases the GIL while hashing
+            with ThreadPoolExecutor(
+                max_workers=min(len(existing_paths), os.cpu_count() or 1),
+                thread_name_prefix="checksum",
+            ) as executor:
+                results = list(executor.map(is_fine, existing_paths))
+            for path, fine in zip(existing_paths, results):
+                if not fine:
+                    self.logger.info("%s is corrupt", path)
+                    corrupt[str(path)] = product_infos[path.stem]
+                    if delete:
+                        path.unlink()
 
         return corrupt
 
-    def _checksum_compare(self, file_path, product_info, block_size=2**13):
-        """Compare a given MD5 checksum with one calculated from a file."""
+    @staticmethod
+    def _checksum_algo(product_info):
+        """Return a hashlib object and the expected checksum for the best available algorithm."""
         if "sha3-256" in product_info:
-            checksum = product_info["sha3-256"]
-            algo = hashlib.sha3_256()
+            return hashlib.sha3_256(), product_info["sha3-256"]
         elif "md5" in product_info:
-            checksum = product_info["md5"]
-            algo = hashlib.md5()
-        else:
-            raise InvalidChecksumError("No checksum information found in product information.")
+            return hashlib.md5(), product_info["md5"]
+        raise InvalidChecksumError("No checksum information found in product information.")
+
+    def _checksum_compare(self, file_path, product_info, block_size=2**20):
+        """Compare a given MD5 checksum with one calculated from a file."""
+        algo, checksum = self._checksum_algo(product_info)
+        self._checksum_update(algo, file_path, block_size)
+        return algo.hexdigest().lower() == checksum.lower()
+
+    def _checksum_update(self, algo, file_path, block_size=2**20, offset=0):
+        """Feed the contents of a file, starting at the given offset, to a hashlib checksum object."""
         file_path = Path(file_path)
         file_size = file_path.stat().st_size
         with self._tqdm(
             desc=f"{algo.name.upper()} checksumming",
-            total=file_size,
+            total=file_size - offset,
             unit="B",
             unit_scale=True,
             leave=False,
         ) as progress:
-            with open(file_path, "rb") as f:
+            # read into a single reusable buffer instead of allocating a new bytes object per block
+            buffer = bytearray(block_size)
+            view = memoryview(buffer)
+            with open(file_path, "rb", buffering=0) as f:
+                if hasattr(os, "posix_fadvise"):
+                    # let the kernel read ahead more aggressively, not available on Windows
+                    try:
+                        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                    except OSError:
+                        # only a hint, e.g. not supported for some special files and filesystems
+                        pass
+                f.seek(offset)
                 while True:
-                    block_data = f.read(block_size)
-                    if not block_data:
+                    n_bytes = f.readinto(buffer)
+                    if not n_bytes:
                         break
-                    algo.update(block_data)
-                    progress.update(len(block_data))
-            return algo.hexdigest().lower() == checksum.lower()
+                    algo.update(view[:n_bytes])
+                    progress.update(n_bytes)
 
     def _tqdm(self, **kwargs):
         """tqdm progressbar wrapper. May be overridden to customize progressbar behavior"""
@@ -1015,30 +1099,28 @@ class SentinelAPI:
 
     @staticmethod
     def _check_scihub_response(response, test_json=True, query_string=None):
-        """Check that the response from server has status code 2xx and that the response is valid JSON."""
+        """Check that the response from server has status code 2xx and that the response is valid JSON.
+
+        Returns the decoded JSON content if `test_json` is True, so that it does not need to be
+        decoded a second time by the caller.
+        """
         # Prevent requests from needing to guess the encoding
         # SciHub appears to be using UTF-8 in all of their responses
         response.encoding = "utf-8"
         try:
             response.raise_for_status()
             if test_json:
-                response.json()
+                return response.json()
         except (requests.HTTPError, ValueError):
             msg = None
             try:
                 msg = response.json()["error"]["message"]["value"]
-            except Exception:
+            except (ValueError, KeyError, TypeError):
                 try:
                     msg = response.headers["cause-message"]
-                except Exception:
+                except KeyError:
                     if not response.text.lstrip().startswith("{"):
-                        try:
-                            h = html2text.HTML2Text()
-                            h.ignore_images = True
-                            h.ignore_anchors = True
-                            msg = h.handle(response.text).strip()
-                        except Exception:
-                            pass
+                        msg = _html_to_text(response)
 
             if msg is None:
                 raise ServerError("Invalid API response", response)
@@ -1103,8 +1185,7 @@ class SentinelAPI:
         url = self._path_to_url(product_info, manifest_name, "json")
         with self.dl_limit_semaphore:
             response = self.session.get(url)
-        self._check_scihub_response(response)
-        info = response.json()["d"]
+        info = self._check_scihub_response(response)["d"]
 
         node_info["size"] = int(info["ContentLength"])
         with self.dl_limit_semaphore:
@@ -1123,6 +1204,8 @@ class SentinelAPI:
 
 def read_geojson(geojson_file):
     """Read a GeoJSON file into a GeoJSON object."""
+    import geojson
+
     with open(geojson_file) as f:
         return geojson.load(f)
 
@@ -1177,6 +1260,17 @@ def geojson_to_wkt(geojson_obj, decimals=4):
         geometry["coordinates"] = ensure_2d(geometry["coordinates"])
         check_bounds(geometry["coordinates"])
 
+    if geometry["type"] == "Polygon" and decimals > 0:
+        # Format the most common case directly, which is considerably faster than geomet.
+        # geomet formats decimals=0 as integers (no "-0"), so that case is left to it.
+        rings = (
+            ",".join(f"{x:.{decimals}f} {y:.{decimals}f}" for x, y in ring)
+            for ring in geometry["coordinates"]
+        )
+        return "POLYGON({})".format(",".join(f"({ring})" for ring in rings))
+
+    import geomet.wkt
+
     wkt = geomet.wkt.dumps(geometry, decimals=decimals)
     # Strip unnecessary spaces
     wkt = re.sub(r"(?<!\d) ", "", wkt)
@@ -1247,6 +1341,23 @@ def _format_query_value(attr, value):
     return value
 
 
+def _compile_valid_date_pattern():
+    # Reference: https://cwiki.apache.org/confluence/display/solr/Working+with+Dates
+
+    # ISO-8601 date or NOW
+    valid_date_pattern = r"^(?:\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d(?:\.\d+)?Z|NOW)"
+    # date arithmetic suffix is allowed
+    units = r"(?:YEAR|MONTH|DAY|HOUR|MINUTE|SECOND)"
+    valid_date_pattern += r"(?:[-+]\d+{}S?)*".format(units)
+    # dates can be rounded to a unit of time
+    # e.g. "NOW/DAY" for dates since 00:00 today
+    valid_date_pattern += r"(?:/{}S?)*$".format(units)
+    return re.compile(valid_date_pattern)
+
+
+_VALID_DATE_PATTERN = _compile_valid_date_pattern()
+
+
 def format_query_date(in_date):
     r"""
     Format a date, datetime or a YYYYMMDD string input as YYYY-MM-DDThh:mm:ssZ
@@ -1275,27 +1386,29 @@ def format_query_date(in_date):
         return in_date.strftime("%Y-%m-%dT%H:%M:%SZ")
     elif not isinstance(in_date, str):
         raise ValueError("Expected a string or a datetime object. Received {}.".format(in_date))
+    return _format_query_date_str(in_date)
+
+
+# str.isdigit() would also accept non-ASCII digits, which strptime() rejects
+_YYYYMMDD_PATTERN = re.compile(r"[0-9]{8}")
 
+
+@lru_cache(maxsize=1024)
+def _format_query_date_str(in_date):
+    # The same date strings tend to be used over and over, e.g. "NOW-1DAY" when polling
     in_date = in_date.strip()
     if in_date == "*":
         # '*' can be used for one-sided range queries e.g. ingestiondate:[* TO NOW-1YEAR]
         return in_date
 
-    # Reference: https://cwiki.apache.org/confluence/display/solr/Working+with+Dates
-
-    # ISO-8601 date or NOW
-    valid_date_pattern = r"^(?:\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d(?:\.\d+)?Z|NOW)"
-    # date arithmetic suffix is allowed
-    units = r"(?:YEAR|MONTH|DAY|HOUR|MINUTE|SECOND)"
-    valid_date_pattern += r"(?:[-+]\d+{}S?)*".format(units)
-    # dates can be rounded to a unit of time
-    # e.g. "NOW/DAY" for dates since 00:00 today
-    valid_date_pattern += r"(?:/{}S?)*$".format(units)
-    in_date = in_date.strip()
-    if re.match(valid_date_pattern, in_date):
+    if _VALID_DATE_PATTERN.match(in_date):
         return in_date
 
     try:
+        if _YYYYMMDD_PATTERN.fullmatch(in_date):
+            # YYYYMMDD, slicing is much cheaper than strptime; date() still validates the values
+            parsed = date(int(in_date[:4]), int(in_date[4:6]), int(in_date[6:]))
+            return parsed.isoformat() + "T00:00:00Z"
         return datetime.strptime(in_date, "%Y%m%d").strftime("%Y-%m-%dT%H:%M:%SZ")
     except ValueError:
         raise ValueError("Unsupported date value {}".format(in_date))
@@ -1319,62 +1432,144 @@ def _format_order_by(order_by):
     return ",".join(output)
 
 
+# Error pages may contain huge stack traces, keep the exception messages readable
+_MAX_ERROR_MESSAGE_LENGTH = 2048
+# Only the start of an error page is parsed, leaving room for the markup around the message
+_MAX_ERROR_PAGE_LENGTH = 32 * _MAX_ERROR_MESSAGE_LENGTH
+
+
+class _HTMLTextExtractor(HTMLParser):
+    """Collect the text content of an HTML document, skipping scripts, styles and comments."""
+
+    _skipped_tags = {"script", "style"}
+    _block_tags = set("br p div h1 h2 h3 h4 h5 h6 li tr title pre article section".split())
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._parts = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._skipped_tags:
+            self._skip_depth += 1
+        elif tag in self._block_tags:
+            self._parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self._skipped_tags:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag in self._block_tags:
+            self._parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self._parts.append(data)
+
+    def text(self):
+        return "".join(self._parts)
+
+
+def _html_to_text(response):
+    """Extract a readable error message from a plain-text or HTML response body."""
+    # Decode only the start of the body, a partial character at the cut is replaced
+    text = response.content[:_MAX_ERROR_PAGE_LENGTH].decode(
+        response.encoding or "utf-8", errors="replace"
+    )
+    content_type = response.headers.get("Content-Type", "text/html")
+    if "html" in content_type.lower():
+        parser = _HTMLTextExtractor()
+        parser.feed(text)
+        parser.close()
+        lines = (" ".join(line.split()) for line in parser.text().splitlines())
+        text = "\n".join(line for line in lines if line)
+    else:
+        text = text.strip()
+    return text[:_MAX_ERROR_MESSAGE_LENGTH]
+
+
+# A single path expression is compiled once and cached by ElementTree,
+# instead of resolving each namespaced tag with a separate find() call
+_GML_COORDINATES_PATH = (
+    "{http://www.opengis.net/gml}outerBoundaryIs"
+    "/{http://www.opengis.net/gml}LinearRing"
+    "/{http://www.opengis.net/gml}coordinates"
+)
+# Matches the plain single polygon footprints returned by DHuS without building an XML tree
+_GML_POLYGON_PATTERN = re.compile(
+    r"\s*<gml:Polygon\b[^>]*>\s*<gml:outerBoundaryIs>\s*<gml:LinearRing>"
+    r"\s*<gml:coordinates>([^<&]*)</gml:coordinates>"
+)
+
+
 def _parse_gml_footprint(geometry_str):
     # workaround for https://github.com/sentinelsat/sentinelsat/issues/286
     if geometry_str is None:  # pragma: no cover
         return None
-    geometry_xml = ET.fromstring(geometry_str)
-    poly_coords_str = (
-        geometry_xml.find("{http://www.opengis.net/gml}outerBoundaryIs")
-        .find("{http://www.opengis.net/gml}LinearRing")
-        .findtext("{http://www.opengis.net/gml}coordinates")
-    )
-    poly_coords = (coord.split(",")[::-1] for coord in poly_coords_str.split(" "))
-    coord_string = ",".join(" ".join(coord) for coord in poly_coords)
-    return "POLYGON(({}))".format(coord_string)
+    match = _GML_POLYGON_PATTERN.match(geometry_str)
+    if match:
+        poly_coords_str = match.group(1)
+    else:
+        geometry_xml = ET.fromstring(geometry_str)
+        poly_coords_str = geometry_xml.findtext(_GML_COORDINATES_PATH)
+    # GML lists "lat,lon" pairs, WKT expects "lon lat"
+    poly_coords = (coord.split(",") for coord in poly_coords_str.split())
+    coord_string = ",".join([lon + " " + lat for lat, lon in poly_coords])
+    return "POLYGON((" + coord_string + "))"
 
 
+# Products of the same acquisition share their sensing and ingestion times, cache the parsed values
+@lru_cache(maxsize=4096)
 def _parse_iso_date(content):
-    if "." in content:
-        return datetime.strptime(content, "%Y-%m-%dT%H:%M:%S.%fZ")
-    else:
+    # "yyyy-MM-ddThh:mm:ssZ" is exactly 20 characters long, anything else must have a fraction
+    if len(content) == 20:
         return datetime.strptime(content, "%Y-%m-%dT%H:%M:%SZ")
+    else:
+        return datetime.strptime(content, "%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+_EPOCH = datetime(1970, 1, 1)
 
 
 def _parse_odata_timestamp(in_date):
     """Convert the timestamp received from OData JSON API to a datetime object."""
-    timestamp = int(in_date.replace("/Date(", "").replace(")/", ""))
-    seconds = timestamp // 1000
-    ms = timestamp % 1000
-    return datetime.utcfromtimestamp(seconds) + timedelta(milliseconds=ms)
+    # "/Date(<milliseconds since epoch>)/"
+    timestamp = int(in_date[6:-2])
+    return _EPOCH + timedelta(milliseconds=timestamp)
+
+
+def _identity(x):
+    return x
+
+
+# Converters for the typed value groups of an OpenSearch entry, other values are kept as strings
+_OPENSEARCH_CONVERTERS = {
+    "date": _parse_iso_date,
+    "int": int,
+    "long": int,
+    "float": float,
+    "double": float,
+}
 
 
 def _parse_opensearch_response(products):
     """Convert a query response to a dictionary.
 
     The resulting dictionary structure is {<product id>: {<property>: <value>}}.
+    The products are kept in the order they were returned by the server.
     The property values are converted to their respective Python types unless `parse_values`
     is set to `False`.
     """
-
-    converters = {"date": _parse_iso_date, "int": int, "long": int, "float": float, "double": float}
-
-    # Keep the string type by default
-    def default_converter(x):
-        return x
-
-    output = OrderedDict()
+    output = {}
     for prod in products:
         product_dict = {}
         prod_id = prod["id"]
         output[prod_id] = product_dict
-        for key in prod:
+        for key, properties in prod.items():
             if key == "id":
                 continue
-            if isinstance(prod[key], str):
-                product_dict[key] = prod[key]
+            if isinstance(properties, str):
+                product_dict[key] = properties
             else:
-                properties = prod[key]
                 if isinstance(properties, dict):
                     properties = [properties]
                 if key == "link":
@@ -1384,7 +1579,7 @@ def _parse_opensearch_response(products):
                             name = "link_" + p["rel"]
                         product_dict[name] = p["href"]
                 else:
-                    f = converters.get(key, default_converter)
+                    f = _OPENSEARCH_CONVERTERS.get(key, _identity)
                     for p in properties:
                         try:
                             if "content" in p:
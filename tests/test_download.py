@@ -8,8 +8,13 @@ There are two minor issues to keep in mind when recording unit tests VCRs.
 
 """
 
+import concurrent.futures
+import hashlib
 import os
 import shutil
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
 
 import py.path
 import pytest
@@ -112,6 +117,108 @@ def test_trigger_lta_failed(http_status_code, exception, headers):
             api.trigger_offline_retrieval(uuid)
 
 
+@pytest.mark.mock_api
+def test_download_resume_checksum(tmpdir):
+    api = SentinelAPI("mock_user", "mock_password")
+    url = api._get_download_url("8df46c9e-a20c-43db-a19a-4240c2ed3b8b")
+    path = tmpdir.join("product.zip.incomplete")
+    path.write_binary(b"full ")
+
+    def respond(request, context):
+        # the existing part has already been hashed when the request is sent
+        assert algo_calls == [(str(path), 0)]
+        return b"content"
+
+    algo_calls = []
+    checksum_update = api._checksum_update
+
+    def record_checksum_update(algo, file_path, offset=0):
+        algo_calls.append((str(file_path), offset))
+        checksum_update(algo, file_path, offset=offset)
+
+    api._checksum_update = record_checksum_update
+    with requests_mock.mock() as rqst:
+        rqst.get(url, content=respond, status_code=206)
+        downloaded_bytes, algo = api.downloader._download(
+            url, Path(path), 12, "product", None, hashlib.md5()
+        )
+    assert downloaded_bytes == 7
+    assert path.read_binary() == b"full content"
+    assert algo.hexdigest() == hashlib.md5(b"full content").hexdigest()
+
+
+@pytest.mark.mock_api
+def test_download_retry_keeps_checksum_state(tmpdir):
+    api = SentinelAPI("mock_user", "mock_password")
+    api.downloader.chunk_size = 4
+    url = api._get_download_url("8df46c9e-a20c-43db-a19a-4240c2ed3b8b")
+    path = Path(tmpdir.join("product.zip.incomplete"))
+    path.write_bytes(b"full ")
+
+    class StopAfterFirstChunk:
+        calls = 0
+
+        def is_set(self):
+            self.calls += 1
+            return self.calls > 1
+
+    algo_calls = []
+    checksum_update = api._checksum_update
+
+    def record_checksum_update(algo, file_path, offset=0):
+        algo_calls.append(offset)
+        checksum_update(algo, file_path, offset=offset)
+
+    api._checksum_update = record_checksum_update
+    with requests_mock.mock() as rqst:
+        rqst.get(url, content=b"content", status_code=206)
+        with pytest.raises(concurrent.futures.CancelledError):
+            api.downloader._download(url, path, 12, "product", StopAfterFirstChunk(), hashlib.md5())
+        assert path.read_bytes() == b"full cont"
+
+        # the retry only hashes the part of the file that the failed attempt has not seen
+        rqst.get(url, content=b"ent", status_code=206)
+        downloaded_bytes, algo = api.downloader._download(
+            url, path, 12, "product", None, hashlib.md5()
+        )
+        assert rqst.last_request.headers["Range"] == "bytes=9-"
+    assert algo_calls == [0, 9]
+    assert downloaded_bytes == 3
+    assert path.read_bytes() == b"full content"
+    assert algo.hexdigest() == hashlib.md5(b"full content").hexdigest()
+    assert not api.downloader._partial_checksums
+
+
+@pytest.mark.mock_api
+def test_trigger_lta_retry_after_not_retried():
+    # requests_mock bypasses the transport adapter, use a local server to include its retries
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            received.append(self.path)
+            self.send_response(503)
+            self.send_header("Retry-After", "1")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        api = SentinelAPI(
+            "mock_user", "mock_password", api_url=f"http://127.0.0.1:{server.server_port}/"
+        )
+        with pytest.raises(LTAError):
+            api.trigger_offline_retrieval("8df46c9e-a20c-43db-a19a-4240c2ed3b8b")
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert len(received) == 1
+
+
 @pytest.mark.vcr
 @pytest.mark.scihub
 def test_download(api, tmpdir, smallest_online_products):
@@ -179,6 +286,27 @@ def test_download(api, tmpdir, smallest_online_products):
     tmpdir.remove()
 
 
+@pytest.mark.mock_api
+def test_download_resume_not_supported(tmpdir):
+    api = SentinelAPI("mock_user", "mock_password")
+    url = api._get_download_url("8df46c9e-a20c-43db-a19a-4240c2ed3b8b")
+    path = tmpdir.join("product.zip.incomplete")
+    path.write_binary(b"garbage")
+
+    with requests_mock.mock() as rqst:
+        # the Range header is ignored and the full file is returned
+        rqst.get(url, content=b"full content", status_code=200)
+        algo = hashlib.md5()
+        downloaded_bytes, algo = api.downloader._download(
+            url, Path(path), 12, "product", None, algo
+        )
+        assert rqst.last_request.headers["Range"] == "bytes=7-"
+    assert downloaded_bytes == 12
+    assert path.read_binary() == b"full content"
+    # the discarded partial content must not be part of the checksum
+    assert algo.hexdigest() == hashlib.md5(b"full content").hexdigest()
+
+
 @pytest.mark.vcr(allow_playback_repeats=True)
 @pytest.mark.scihub
 def test_download_all(api, tmpdir, smallest_online_products):
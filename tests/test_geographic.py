@@ -47,6 +47,22 @@ def test_get_coordinates(fixture_path):
     assert geojson_to_wkt(read_geojson(fixture_path("map_collection.geojson"))) == wkt_collection
 
 
+@pytest.mark.fast
+def test_polygon_to_wkt_decimals():
+    polygon = {
+        "type": "Polygon",
+        "coordinates": [
+            [[0, 0], [10.123456, 0], [10.123456, -9.99999], [0, 0]],
+            [[1, 1], [2, 1], [2, -0.00001], [1, 1]],
+        ],
+    }
+    assert geojson_to_wkt(polygon) == (
+        "POLYGON((0.0000 0.0000,10.1235 0.0000,10.1235 -10.0000,0.0000 0.0000),"
+        "(1.0000 1.0000,2.0000 1.0000,2.0000 -0.0000,1.0000 1.0000))"
+    )
+    assert geojson_to_wkt(polygon, decimals=0) == "POLYGON((0 0,10 0,10 -10,0 0),(1 1,2 1,2 0,1 1))"
+
+
 @pytest.mark.vcr
 @pytest.mark.scihub
 def test_footprints_s1(api, test_wkt, read_fixture_file):
@@ -1,12 +1,20 @@
+import errno
 import hashlib
+import os
+from datetime import datetime
 
 import pytest
 import requests
 import requests_mock
 
 from sentinelsat import SentinelAPI
-from sentinelsat.exceptions import SentinelAPIError, QuerySyntaxError, InvalidKeyError
-from sentinelsat.sentinel import _parse_opensearch_response
+from sentinelsat.exceptions import (
+    SentinelAPIError,
+    QuerySyntaxError,
+    InvalidKeyError,
+    ServerError,
+)
+from sentinelsat.sentinel import _parse_iso_date, _parse_opensearch_response
 
 
 @pytest.mark.fast
@@ -35,6 +43,20 @@ def test_checksumming_progressbars(capsys, fixture_path, algo_name, algo_constru
     assert "checksumming" not in err
 
 
+@pytest.mark.fast
+def test_checksum_fadvise_error(monkeypatch, fixture_path):
+    def posix_fadvise(*args):
+        raise OSError(errno.EINVAL, "Invalid argument")
+
+    monkeypatch.setattr(os, "posix_fadvise", posix_fadvise, raising=False)
+    monkeypatch.setattr(os, "POSIX_FADV_SEQUENTIAL", 2, raising=False)
+    api = SentinelAPI("mock_user", "mock_password", show_progressbars=False)
+    path = fixture_path("map.geojson")
+    with open(path, "rb") as f:
+        real_checksum = hashlib.md5(f.read()).hexdigest()
+    assert api._checksum_compare(path, {"md5": real_checksum}) is True
+
+
 @pytest.mark.vcr
 @pytest.mark.scihub
 def test_unicode_support(api):
@@ -105,6 +127,52 @@ def test_get_products_invalid_json(test_wkt):
         assert excinfo.value.msg == "Invalid API response"
 
 
+@pytest.mark.mock_api
+def test_html_error_response():
+    api = SentinelAPI("mock_user", "mock_password")
+    with requests_mock.mock() as rqst:
+        rqst.get(
+            "https://apihub.copernicus.eu/apihub/odata/v1/Products('8df46c9e-a20c-43db-a19a-4240c2ed3b8b')?$format=json",
+            text="<!DOCTYPE html><html><head><style>p { color: red; }</style></head>"
+            "<body><h1>Internal&nbsp;Error</h1><!-- <p>hidden</p> -->"
+            "<p>Please <b>try again</b> later &amp; report it.</p></body></html>",
+            status_code=500,
+        )
+        with pytest.raises(ServerError) as excinfo:
+            api.get_product_odata("8df46c9e-a20c-43db-a19a-4240c2ed3b8b")
+        assert excinfo.value.msg == "Internal Error\nPlease try again later & report it."
+
+        rqst.get(
+            "https://apihub.copernicus.eu/apihub/odata/v1/Products('8df46c9e-a20c-43db-a19a-4240c2ed3b8b')?$format=json",
+            text="<html><body><pre>" + "at some.Frame\n" * 10000 + "</pre></body></html>",
+            status_code=500,
+        )
+        with pytest.raises(ServerError) as excinfo:
+            api.get_product_odata("8df46c9e-a20c-43db-a19a-4240c2ed3b8b")
+        assert excinfo.value.msg.startswith("at some.Frame\nat some.Frame")
+        assert len(excinfo.value.msg) == 2048
+
+        rqst.get(
+            "https://apihub.copernicus.eu/apihub/odata/v1/Products('8df46c9e-a20c-43db-a19a-4240c2ed3b8b')?$format=json",
+            text=" " * 1000 + "<h1>Error</h1><p>Quota exceeded</p>" + "<script>a" * 100000,
+            headers={"Content-Type": "text/html;charset=utf-8"},
+            status_code=500,
+        )
+        with pytest.raises(ServerError) as excinfo:
+            api.get_product_odata("8df46c9e-a20c-43db-a19a-4240c2ed3b8b")
+        assert excinfo.value.msg == "Error\nQuota exceeded"
+
+        rqst.get(
+            "https://apihub.copernicus.eu/apihub/odata/v1/Products('8df46c9e-a20c-43db-a19a-4240c2ed3b8b')?$format=json",
+            text="  Expected <value> &amp; got none\n",
+            headers={"Content-Type": "text/plain"},
+            status_code=500,
+        )
+        with pytest.raises(ServerError) as excinfo:
+            api.get_product_odata("8df46c9e-a20c-43db-a19a-4240c2ed3b8b")
+        assert excinfo.value.msg == "Expected <value> &amp; got none"
+
+
 @pytest.mark.scihub
 def test_get_products_size(api, vcr, products):
     assert SentinelAPI.get_products_size(products) == 75.4
@@ -119,6 +187,15 @@ def test_get_products_size(api, vcr, products):
     assert SentinelAPI.get_products_size(products) == 0
 
 
+@pytest.mark.fast
+def test_parse_iso_date():
+    assert _parse_iso_date("2015-12-23T14:29:42Z") == datetime(2015, 12, 23, 14, 29, 42)
+    assert _parse_iso_date("2015-12-23T14:29:42.026Z") == datetime(2015, 12, 23, 14, 29, 42, 26000)
+    assert _parse_iso_date("2015-12-23T14:29:42.5Z") == datetime(2015, 12, 23, 14, 29, 42, 500000)
+    with pytest.raises(ValueError):
+        _parse_iso_date("2015-12-23")
+
+
 @pytest.mark.scihub
 def test_response_to_dict(raw_products):
     dictionary = _parse_opensearch_response(raw_products)
@@ -222,3 +299,21 @@ def test_check_existing(api, tmpdir, smallest_online_products, smallest_archived
         api.check_files()
 
     tmpdir.remove()
+
+
+@pytest.mark.mock_api
+def test_check_existing_duplicate_titles(tmpdir, monkeypatch):
+    api = SentinelAPI("mock_user", "mock_password")
+    product_infos = {
+        pid: {"id": pid, "title": "P", "size": 3, "md5": "d41d8cd98f00b204e9800998ecf8427e"}
+        for pid in ["a", "b"]
+    }
+    monkeypatch.setattr(api, "get_product_odata", lambda pid: product_infos[pid])
+    monkeypatch.setattr(api, "_get_filename", lambda product_info: "P.zip")
+    path = tmpdir.join("P.zip")
+    path.write_binary(b"bad")
+
+    result = api.check_files(ids=["a", "b"], directory=str(tmpdir), delete=True)
+    assert list(result) == [str(path)]
+    assert sorted(info["id"] for info in result[str(path)]) == ["a", "b"]
+    assert not path.check(exists=1)
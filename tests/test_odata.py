@@ -9,7 +9,7 @@ import requests_mock
 
 from sentinelsat import SentinelAPI
 from sentinelsat.exceptions import InvalidKeyError, ServerError
-from sentinelsat.sentinel import _parse_odata_timestamp
+from sentinelsat.sentinel import _parse_gml_footprint, _parse_odata_timestamp
 from .conftest import chain, scrub_string
 
 
@@ -29,6 +29,23 @@ def test_convert_timestamp():
     )
 
 
+@pytest.mark.fast
+def test_parse_gml_footprint():
+    gml = (
+        '<gml:Polygon srsName="http://www.opengis.net/gml/srs/epsg.xml#4326" '
+        'xmlns:gml="http://www.opengis.net/gml">\n   <gml:outerBoundaryIs>\n      <gml:LinearRing>\n'
+        "         <gml:coordinates>63.138,1.21834 63.9204,0.535948\n64.6998,-0.182113 "
+        "63.138,1.21834</gml:coordinates>\n      </gml:LinearRing>\n   </gml:outerBoundaryIs>\n"
+        "</gml:Polygon>"
+    )
+    expected = "POLYGON((1.21834 63.138,0.535948 63.9204,-0.182113 64.6998,1.21834 63.138))"
+    assert _parse_gml_footprint(gml) == expected
+    # a different namespace prefix is handled by the XML parser fallback
+    assert (
+        _parse_gml_footprint(gml.replace("gml:", "g:").replace("xmlns:gml", "xmlns:g")) == expected
+    )
+
+
 @pytest.mark.vcr
 @pytest.mark.scihub
 def test_get_product_odata_short(api, odata_product_ids, read_yaml):
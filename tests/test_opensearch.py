@@ -2,6 +2,8 @@
 Tests for functionality related to the OpenSearch API of SciHub (https://apihub.copernicus.eu/apihub/search?...)
 """
 
+import re
+import threading
 from contextlib import contextmanager
 from datetime import datetime, date, timedelta
 
@@ -66,6 +68,12 @@ def test_format_date(api):
             api.query(raw="ingestiondate:[{} TO *]".format(date_str), limit=0)
 
 
+@pytest.mark.fast
+def test_format_date_non_ascii_digits():
+    with pytest.raises(ValueError):
+        format_query_date("２０１５０１０１")
+
+
 @pytest.mark.vcr
 @pytest.mark.scihub
 def test_SentinelAPI_connection(api, small_query):
@@ -393,6 +401,8 @@ def test_small_query(api, small_query):
 @pytest.mark.vcr(decode_compressed_response=False)
 @pytest.mark.scihub
 def test_large_query(api, large_query):
+    # cassette playback is not thread-safe, fetch the pages one at a time
+    api.concurrent_dl_limit = 1
     full_products = list(api.query(**large_query))
     assert api._last_query == (
         'beginPosition:["2015-12-01T00:00:00Z" TO "2015-12-31T00:00:00Z"] '
@@ -547,3 +557,61 @@ def test_query_by_names(api, smallest_online_products):
 def test_empty_query(api):
     with pytest.raises(ValueError):
         api.query()
+
+
+@pytest.mark.mock_api
+def test_concurrent_query_pages(monkeypatch):
+    api = SentinelAPI("mock_user", "mock_password", show_progressbars=False)
+    api.page_size = 2
+    total = 9
+    responded = []
+
+    def page(request, context):
+        start = int(request.qs["start"][0])
+        rows = int(request.qs["rows"][0])
+        responded.append(start)
+        entries = [{"id": f"id{i}", "title": f"title{i}"} for i in range(start, start + rows)]
+        return {"feed": {"opensearch:totalResults": str(total), "entry": entries}}
+
+    session_get = api.session.get
+    # Events set once the page at the given offset has been answered, one per concurrent page
+    answered = {}
+
+    def ordered_get(url, **kwargs):
+        # requests_mock handles one request at a time, hold back each concurrent page before
+        # sending it until the next page has been answered, so that the pages come back in reverse
+        start = int(re.search(r"start=(\d+)", url).group(1))
+        if start in answered and start + api.page_size in answered:
+            assert answered[start + api.page_size].wait(timeout=10)
+        response = session_get(url, **kwargs)
+        if start in answered:
+            answered[start].set()
+        return response
+
+    monkeypatch.setattr(api.session, "get", ordered_get)
+
+    def expect_pages(*starts):
+        responded.clear()
+        answered.clear()
+        answered.update((start, threading.Event()) for start in starts)
+
+    with requests_mock.mock() as rqst:
+        rqst.get("https://apihub.copernicus.eu/apihub/search", json=page)
+
+        expect_pages(3, 5, 7)
+        products = api.query(raw="*", offset=1)
+        assert responded == [1, 7, 5, 3]
+        assert list(products) == [f"id{i}" for i in range(1, total)]
+        assert "start=1&" in api._last_response.request.url
+
+        expect_pages(4)
+        products = api.query(raw="*", limit=4, offset=2)
+        assert responded == [2, 4]
+        assert list(products) == [f"id{i}" for i in range(2, 6)]
+
+        expect_pages(3, 5)
+        products = api.query(raw="*", limit=5, offset=1)
+        assert responded == [1, 5, 3]
+        assert [r.qs["rows"] for r in rqst.request_history[-3:]] == [["2"], ["1"], ["2"]]
+        assert list(products) == [f"id{i}" for i in range(1, 6)]
+        assert "start=1&" in api._last_response.request.url